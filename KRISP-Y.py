@@ -19,6 +19,7 @@ from collections import Counter
 from KRISP import run_model
 from data_handling import check_file_permission, blank_entry_check
 from data_handling import deduplicate_by_max_confidence
+from data_handling import find_granule_subdirs, parse_sentinel_folder
 from image_handling import image_to_array
 from misc import convert_seconds_to_hms, confirm_continue_or_exit
 from user_interfacing import start_spinner, end_spinner
@@ -56,9 +57,8 @@ stop_event, thread = start_spinner(message="pre-run preparation")
 ####folder = ("S2C_MSIL2A_20250331T110651_N0511_R137_T30UXC_20250331T143812.SAFE")
 folder = ("S2C_MSIL2A_20250331T110651_N0511_R137_T31UCU_20250331T143812.SAFE")
 
-(sentinel_name, instrument_and_product_level, datatake_start_sensing_time, 
- processing_baseline_number, relative_orbit_number, tile_number_field, 
- product_discriminator_and_format) = folder.split("_")
+(tile_number_field, datatake_start_sensing_time,
+ prefix) = parse_sentinel_folder(folder)
 
 real_n_chunks = math.floor(math.sqrt(n_chunks)) ** 2 - 1
 model_epochs = 150 # 150 for ndwi, 151 for tci
@@ -117,16 +117,17 @@ if n_chunk_preds == 0:
                 confidence = float(cell.split(" ")[-1])
             except:
                 confidence = 100
-            if "reservoir" in cell.strip().lower():
+            cell_key = cell.strip().lower()
+            if "reservoir" in cell_key:
                 if confidence >= confidence_threshold:
                     res_predictions.append([i, confidence])
-            if "water" in cell.strip().lower():
+            if "water" in cell_key:
                 if confidence >= confidence_threshold:
                     bod_predictions.append([i, confidence])
-            if "land" in cell.strip().lower():
+            if "land" in cell_key:
                 if confidence >= confidence_threshold:
                     land_predictions.append([i, confidence])
-            if "sea" in cell.strip().lower():
+            if "sea" in cell_key:
                 if confidence >= confidence_threshold:
                     sea_predictions.append([i, confidence])
     
@@ -161,9 +162,7 @@ if n_chunk_preds == 0:
     
     # %%% creating the reservoir map
     path = os.path.join(os.getcwd(), "GRANULE")
-    subdirs = [d for d in os.listdir(path) 
-               if os.path.isdir(os.path.join(path, d))]
-    prefix = (f"{tile_number_field}_{datatake_start_sensing_time}")
+    subdirs = find_granule_subdirs(path)
     map_image = image_to_array(os.path.join(os.getcwd(), "GRANULE", 
                                             subdirs[0], "IMG_DATA", 
                                             f"R{res}m", 
@@ -191,16 +190,15 @@ if n_chunk_preds == 0:
     chunk_length = side_length / chunks_per_side
     
     # %%%% plotting reservoir map
-    for res_item in deduplicated_sorted_res:      
-        chunk = int(res_item[0])
-        chunk_col = chunk % chunks_per_side
-        chunk_ulx = chunk_col * chunk_length
-        
-        chunk_row = chunk // chunks_per_side
-        chunk_uly = chunk_row * chunk_length
-        
-        marker_color = cmap(norm(res_item[1]))
-        ax.plot(chunk_ulx, chunk_uly, marker="o", color=marker_color, ms=2)
+    # one scatter call places every marker with a single artist, instead
+    # of ax.plot building one Line2D object per predicted chunk
+    chunk_ids = np.array([int(res_item[0])
+                          for res_item in deduplicated_sorted_res])
+    chunk_ulxs = (chunk_ids % chunks_per_side) * chunk_length
+    chunk_ulys = (chunk_ids // chunks_per_side) * chunk_length
+    res_confidences = [res_item[1] for res_item in deduplicated_sorted_res]
+    ax.scatter(chunk_ulxs, chunk_ulys, s=4, c=res_confidences,
+               cmap=cmap, norm=norm)
     end_spinner(stop_event, thread)
     
     # %%%% saving reservoir map
@@ -209,7 +207,10 @@ if n_chunk_preds == 0:
         plot_name_base = "the_map"
         counter = 0
         plot_name = f"{plot_name_base}.jpg"
-        while os.path.exists(plot_name):
+        # resolve the name against one directory listing instead of a
+        # stat call per already-saved map
+        existing_names = {entry.name for entry in os.scandir(os.getcwd())}
+        while plot_name in existing_names:
             counter += 1
             plot_name = f"{plot_name_base}_{counter}.jpg"
         plt.savefig(plot_name, dpi=3000, bbox_inches="tight")
@@ -272,16 +273,11 @@ if n_chunk_preds == 0:
     # %%%% plotting everything bagel map
     for i, deduplicated_sorted_class in enumerate(deduplicated_sorted_classes):
         stop_event, thread = start_spinner(message=f"plotting class {i+1}")
-        for element in deduplicated_sorted_class:
-            chunk = int(element[0])
-            chunk_col = chunk % chunks_per_side
-            chunk_ulx = chunk_col * chunk_length
-            
-            chunk_row = chunk // chunks_per_side
-            chunk_uly = chunk_row * chunk_length
-            
-            marker_color = colours[i]
-            ax.plot(chunk_ulx, chunk_uly, marker="o", color=marker_color, ms=1)
+        chunk_ids = np.array([int(element[0])
+                              for element in deduplicated_sorted_class])
+        chunk_ulxs = (chunk_ids % chunks_per_side) * chunk_length
+        chunk_ulys = (chunk_ids // chunks_per_side) * chunk_length
+        ax.scatter(chunk_ulxs, chunk_ulys, s=1, color=colours[i])
         end_spinner(stop_event, thread)
     
     # %%%% saving everything bagel map
@@ -290,7 +286,8 @@ if n_chunk_preds == 0:
         plot_name_base = "the_everything_bagel"
         counter = 0
         plot_name = f"{plot_name_base}.jpg"
-        while os.path.exists(plot_name):
+        existing_names = {entry.name for entry in os.scandir(os.getcwd())}
+        while plot_name in existing_names:
             counter += 1
             plot_name = f"{plot_name_base}_{counter}.jpg"
         plt.savefig(plot_name, dpi=3000, bbox_inches="tight")
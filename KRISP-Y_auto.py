@@ -10,6 +10,7 @@ import math
 # %%% ii. Import Internal Functions
 from KRISP import run_model
 from data_handling import check_file_permission, blank_entry_check
+from data_handling import parse_sentinel_folder
 from misc import convert_seconds_to_hms
 from user_interfacing import start_spinner, end_spinner
 
@@ -47,9 +48,8 @@ stop_event, thread = start_spinner(message="pre-run preparation")
 ##folder = ("S2C_MSIL2A_20250331T110651_N0511_R137_T30UXC_20250331T143812.SAFE")
 folder = ("S2C_MSIL2A_20250331T110651_N0511_R137_T31UCU_20250331T143812.SAFE")
 
-(sentinel_name, instrument_and_product_level, datatake_start_sensing_time, 
- processing_baseline_number, relative_orbit_number, tile_number_field, 
- product_discriminator_and_format) = folder.split("_")
+(tile_number_field, datatake_start_sensing_time,
+ prefix) = parse_sentinel_folder(folder)
 
 real_n_chunks = math.floor(math.sqrt(n_chunks)) ** 2 - 1
 # model_epoch_options = [50, 55, 60, 65, 70]
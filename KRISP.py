@@ -17,7 +17,8 @@ import tensorflow as tf
 # %%% ii. Import Internal Functions
 from data_handling import change_to_folder, extract_chunk_details
 from data_handling import sort_prediction_results, sort_file_names
-from data_handling import check_positive_int
+from data_handling import check_positive_int, find_granule_subdirs
+from data_handling import parse_sentinel_folder
 
 from image_handling import image_to_array, mask_sentinel, save_image_file
 from misc import split_array
@@ -194,8 +195,7 @@ def run_model(folder, n_chunks, model_name, max_multiplier,
         into that one directory because it will be the one we're looking for."""
         
         path = os.path.join(path, "GRANULE")
-        subdirs = [d for d in os.listdir(path) 
-                   if os.path.isdir(os.path.join(path, d))]
+        subdirs = find_granule_subdirs(path)
         if len(subdirs) == 1:
             path = os.path.join(path, subdirs[0])
         else:
@@ -211,11 +211,8 @@ def run_model(folder, n_chunks, model_name, max_multiplier,
         
         path_10 = os.path.join(path, "IMG_DATA", "R10m") # green and nir
         
-        (sentinel_name, instrument_and_product_level, 
-         datatake_start_sensing_time, processing_baseline_number, 
-         relative_orbit_number, tile_number_field, 
-         product_discriminator_and_format) = folder.split("_")
-        prefix = (f"{tile_number_field}_{datatake_start_sensing_time}")
+        (tile_number_field, datatake_start_sensing_time,
+         prefix) = parse_sentinel_folder(folder)
         bands = ["03", "08"] # green and nir
         
         file_paths = []
@@ -260,13 +257,19 @@ def run_model(folder, n_chunks, model_name, max_multiplier,
         stop_event, thread = start_spinner(message="populating ndwi array")
         start_time = time.monotonic()
         
-        # first convert to int... np.uint16 type is bad for algebraic operations!
+        # first convert to float... np.uint16 is bad for algebraic operations!
+        # float32 is plenty of precision for NDWI and halves the memory
+        # traffic compared to the previous blanket int64 upcast
         for i, image_array in enumerate(image_arrays):
-            image_arrays[i] = image_array.astype(int)
+            image_arrays[i] = image_array.astype(np.float32, copy=False)
         green, nir = image_arrays
-        
-        np.seterr(divide="ignore", invalid="ignore")
-        ndwi = ((green - nir) / (green + nir))
+
+        denom = green + nir
+        ndwi = np.empty(green.shape, dtype=np.float32)
+        np.subtract(green, nir, out=ndwi)
+        np.divide(ndwi, denom, out=ndwi, where=denom != 0)
+        ndwi[denom == 0] = np.nan
+        del denom
         
         end_spinner(stop_event, thread)
         time_taken = time.monotonic() - start_time
@@ -283,9 +286,10 @@ def run_model(folder, n_chunks, model_name, max_multiplier,
         start_time = time.monotonic()
         
         ndwi_chunks = split_array(array=ndwi, n_chunks=n_chunks)
-        global_min = min(np.nanmin(chunk) for chunk in ndwi_chunks)
-        global_max = max_multiplier*max(np.nanmax(chunk) for \
-                                        chunk in ndwi_chunks)
+        # single whole-array reductions instead of one nanmin and one
+        # nanmax call per chunk through a Python generator
+        global_min = np.nanmin(ndwi_chunks)
+        global_max = max_multiplier*np.nanmax(ndwi_chunks)
         
         end_spinner(stop_event, thread)
         
@@ -17,6 +17,16 @@ from tensorflow import keras
 from tensorflow.keras import layers
 from tensorflow.keras.models import Sequential
 
+# mixed float16 halves activation memory and roughly doubles conv/matmul
+# throughput on tensor-core GPUs; on a CPU-only run it only adds casts,
+# so it is enabled only when a GPU is actually present
+if tf.config.list_physical_devices("GPU"):
+    tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+# channels_last is the default, but pinning it guards against a stray
+# ~/.keras config flipping the conv layout away from cuDNN's fast path
+keras.backend.set_image_data_format("channels_last")
+
 # %%% ii. Import Internal Functions
 from image_handling import image_to_array
 from user_interfacing import start_spinner, end_spinner
@@ -205,7 +215,9 @@ model = Sequential([
   layers.Dense(128, activation='relu'),
 
   # Output layer: num_classes units, no activation (logits output)
-  layers.Dense(num_classes, name="outputs")
+  # kept in float32 so the softmaxed logits stay numerically stable
+  # under the mixed precision policy
+  layers.Dense(num_classes, name="outputs", dtype="float32")
 ], name=f"{MODEL_TYPE}_classifier")
 
 end_spinner(stop_event, thread)
@@ -328,8 +340,10 @@ if os.path.exists(test_image_path):
         img_array = tf.keras.utils.img_to_array(img)
         img_array = tf.expand_dims(img_array, 0) # Create a batch
 
-        # Make prediction
-        predictions = model.predict(img_array)
+        # Make prediction - calling the model directly skips the tf.data
+        # wrapping and progress-bar machinery model.predict spins up, which
+        # dwarfs the actual compute for a single image
+        predictions = model(img_array, training=False).numpy()
         # Apply softmax to get probabilities because the model outputs logits
         score = tf.nn.softmax(predictions[0])
 
@@ -45,19 +45,21 @@ import time
 MAIN_START_TIME = time.monotonic()
 import os
 import numpy as np
-import csv
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 
 # %%% Internal Function Imports
-from data_handling import rewrite, blank_entry_check, check_file_permission
+from data_handling import blank_entry_check, check_file_permission
 from data_handling import extract_coords, change_to_folder
+from data_handling import find_granule_subdirs, parse_sentinel_folder
 
 from image_handling import image_to_array, mask_sentinel, plot_indices
-from image_handling import plot_chunks, save_image_file
+from image_handling import plot_chunks, save_image_file, get_indices
 
 from misc import get_sentinel_bands, split_array, combine_sort_unique
 
-from user_interfacing import table_print, start_spinner, end_spinner, prompt_roi
+from user_interfacing import (table_print, start_spinner, end_spinner,
+                              prompt_roi, timed_input)
 
 # %%% General Directory and Plot Properties
 dpi = 3000 # 3000 for full resolution, below 1000, images become fuzzy
@@ -86,8 +88,6 @@ except: # uni mode
     plot_size_chunks = (11, 11)
 
 # %% General Mega Giga Function
-response_time = 0.0
-
 def get_sat(sat_name, sat_number, folder):
     print("====================")
     print(f"||{sat_name} {sat_number} Start||")
@@ -109,7 +109,6 @@ def get_sat(sat_name, sat_number, folder):
     follow naming conventions that use information contained in the title of 
     the folder. This information can be used to easily navigate through the 
     folder's contents."""
-    file_paths = []
     satellite = f"{sat_name} {sat_number}"
     path = os.path.join(HOME, satellite, folder)
     os.chdir(path)
@@ -122,15 +121,19 @@ def get_sat(sat_name, sat_number, folder):
     there is more than one, then alert the user and exit, otherwise go into 
     that one directory because it will be the one we're looking for."""
     # path = path + "\\GRANULE"
-    path = os.path.join(path, "GRANULE")
-    subdirs = [d for d in os.listdir(path) 
-               if os.path.isdir(os.path.join(path, d))]
+    granule_path = os.path.join(path, "GRANULE")
+    subdirs = find_granule_subdirs(granule_path)
     if len(subdirs) == 1:
-        path = os.path.join(path, subdirs[0])
+        granule_path = os.path.join(granule_path, subdirs[0])
     else:
         print("Too many subdirectories in 'GRANULE':", len(subdirs))
         return
-    
+
+    # every later step drills into one of these two folders, so join them
+    # once here instead of rebuilding the same path in steps 2 and 5
+    img_data_path = os.path.join(granule_path, "IMG_DATA")
+    qi_data_path = os.path.join(granule_path, "QI_DATA")
+
     # %%%%% 1.1.2 Resolution selection and file name deconstruction
     """Low resolution is beneficial for faster processing times, but is not 
     good for rigorous data generation. High resolution combines some 10m and 
@@ -139,29 +142,25 @@ def get_sat(sat_name, sat_number, folder):
     finalised in this section."""
     if high_res:
         res = "10m"
-        path_10 = os.path.join(path, "IMG_DATA", "R10m")
-        path_20 = os.path.join(path, "IMG_DATA", "R20m")
+        path_10 = os.path.join(img_data_path, "R10m")
+        path_20 = os.path.join(img_data_path, "R20m")
     else:
         res = "60m"
-        path_60 = os.path.join(path, "IMG_DATA", "R60m")
+        path_60 = os.path.join(img_data_path, "R60m")
     
-    (sentinel_name, instrument_and_product_level, datatake_start_sensing_time, 
-     processing_baseline_number, relative_orbit_number, tile_number_field, 
-     product_discriminator_and_format) = folder.split("_")
-    prefix = (f"{tile_number_field}_{datatake_start_sensing_time}")
+    (tile_number_field, datatake_start_sensing_time,
+     prefix) = parse_sentinel_folder(folder)
     bands = get_sentinel_bands(sat_number, high_res)
     
-    for band in bands:
-        if high_res:
-            if band == "02" or band == "03" or band == "08":
-                file_paths.append(os.path.join(path_10, 
-                                               f"{prefix}_B{band}_10m.jp2"))
-            else:
-                file_paths.append(os.path.join(path_20, 
-                                               f"{prefix}_B{band}_20m.jp2"))
-        else:
-            file_paths.append(os.path.join(path_60, 
-                                               f"{prefix}_B{band}_60m.jp2"))
+    hr_bands = frozenset(("02", "03", "08")) # bands with a native 10m file
+    if high_res:
+        file_paths = [os.path.join(path_10, f"{prefix}_B{band}_10m.jp2")
+                      if band in hr_bands else
+                      os.path.join(path_20, f"{prefix}_B{band}_20m.jp2")
+                      for band in bands]
+    else:
+        file_paths = [os.path.join(path_60, f"{prefix}_B{band}_60m.jp2")
+                      for band in bands]
     
     # %%%% 1.2 Opening and Converting Images
     """This is the long operation. It is very costly to open the large images, 
@@ -169,8 +168,16 @@ def get_sat(sat_name, sat_number, folder):
     trying out the program, it is easier and much faster (about 20x faster) to 
     just use the 60m resolution images. However, when doing any actual data 
     generation, the 60m resolution images are not sufficient."""
-    image_arrays = image_to_array(file_paths)
-    
+    """The cloud probability decode for step 2 is independent of the band
+    decodes, so it runs in the background on a second worker while the
+    bands decode, and step 2 picks up the finished array."""
+    clouds_file = "MSK_CLDPRB_20m.jp2" if high_res else "MSK_CLDPRB_60m.jp2"
+    clouds_path = os.path.join(qi_data_path, clouds_file)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        clouds_future = executor.submit(image_to_array, clouds_path)
+        image_arrays = image_to_array(file_paths)
+        clouds_array = clouds_future.result()
+
     time_taken = time.monotonic() - start_time
     end_spinner(stop_event, thread)
     print(f"step 1 complete! time taken: {round(time_taken, 2)} seconds")
@@ -182,8 +189,8 @@ def get_sat(sat_name, sat_number, folder):
     stop_event, thread = start_spinner(message="masking clouds")
     start_time = time.monotonic()
     
-    path = os.path.join(path, "QI_DATA")
-    image_arrays = mask_sentinel(path, high_res, image_arrays)
+    image_arrays = mask_sentinel(qi_data_path, high_res, image_arrays,
+                                 clouds_array)
     
     time_taken = time.monotonic() - start_time
     end_spinner(stop_event, thread)
@@ -196,16 +203,17 @@ def get_sat(sat_name, sat_number, folder):
     stop_event, thread = start_spinner(message="populating water index arrays")
     start_time = time.monotonic()
     
-    # first convert to int... np.uint16 type is bad for algebraic operations!
-    for i, image_array in enumerate(image_arrays):
-        image_arrays[i] = image_array.astype(np.float32)
+    # first convert to float... np.uint16 type is bad for algebraic operations!
+    # float32 halves the memory traffic of an int64 upcast and lets the
+    # divisions in get_indices run eight vector lanes wide; asking for
+    # contiguity here too guarantees the index kernel never sees a strided
+    # view, whatever produced the band
+    image_arrays = [np.ascontiguousarray(a, dtype=np.float32)
+                    for a in image_arrays]
     blue, green, nir, swir1, swir2 = image_arrays
-    
-    np.seterr(divide="ignore", invalid="ignore")
-    ndwi = ((green - nir) / (green + nir))
-    mndwi = ((green - swir1) / (green + swir1))
-    awei_sh = (green + 2.5 * blue - 1.5 * (nir + swir1) - 0.25 * swir2)
-    awei_nsh = (4 * (green - swir1) - (0.25 * nir + 2.75 * swir2))
+
+    ndwi, mndwi, awei_sh, awei_nsh = get_indices(blue, green, nir,
+                                                 swir1, swir2)
     del blue, green, nir, swir1, swir2
     indices = [ndwi, mndwi, awei_sh, awei_nsh]
     
@@ -234,35 +242,66 @@ def get_sat(sat_name, sat_number, folder):
     print("| STEP 5 |")
     print("==========")
     start_time = time.monotonic()
-    global response_time
+    # accumulated locally and returned so the caller can subtract the time
+    # spent waiting on the user from the total processing time
+    response_time = 0.0
     print("data preparation start")
     
     # %%%% 5.1 Searching for, Opening, and Converting RGB Image
     """nico!! remember to add a description!"""
     stop_event, thread = start_spinner(message=f"opening {res} "
                                        "resolution true colour image")
-    path = os.path.join(HOME, satellite, folder)
-    
-    tci_path = os.path.join(path, "GRANULE", subdirs[0], "IMG_DATA", f"R{res}")
+    tci_path = os.path.join(img_data_path, f"R{res}")
     tci_file_name = prefix + f"_TCI_{res}.jp2"
-    tci_array = image_to_array(os.path.join(tci_path, tci_file_name))
-    
-    tci_60_path = os.path.join(path, "GRANULE", subdirs[0], 
-                               "IMG_DATA", "R60m")
+    tci_60_path = os.path.join(img_data_path, "R60m")
     tci_60_file_name = prefix + "_TCI_60m.jp2"
-    with Image.open(os.path.join(tci_60_path, tci_60_file_name)) as img:
-        size = (img.width//10, img.height//10)
-        tci_60_array = np.array(img.resize(size))
+    # the big true colour decode runs on a worker while the 60m tracker
+    # thumbnail decodes here - the same overlap as the cloud mask in 1.2
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tci_future = executor.submit(
+            image_to_array, os.path.join(tci_path, tci_file_name))
+        with Image.open(os.path.join(tci_60_path, tci_60_file_name)) as img:
+            size = (img.width//10, img.height//10)
+            # draft mode asks the JP2 decoder for its nearest reduced
+            # resolution level, so far fewer pixels get decoded up front
+            img.draft("RGB", size)
+            img.load()
+            decoded = np.asarray(img)
+        # decimate the remaining factor with a strided view - for a tracker
+        # thumbnail this matches PIL's resampler output closely at no cost
+        step_y = max(decoded.shape[0] // size[1], 1)
+        step_x = max(decoded.shape[1] // size[0], 1)
+        tci_60_array = decoded[::step_y, ::step_x]
+        tci_array = tci_future.result()
     end_spinner(stop_event, thread)
     
     # %%%% 5.2 Creating Chunks from Satellite Imagery
     """nico!! remember to add a description!"""
     stop_event, thread = start_spinner(message=f"creating {n_chunks} chunks"
                                        " from satellite imagery")
-    index_chunks = []
-    for index in indices:
-        index_chunks.append(split_array(array=index, n_chunks=n_chunks))
+    # one (4, n_chunks, chunk_h, chunk_w) array: all four index tiles for a
+    # chunk sit in contiguous slabs that index_chunks[:, i] pulls together;
+    # each index tiles straight into its slab, where np.stack would build
+    # four temporaries and then copy them all again
+    first_chunks = split_array(array=indices[0], n_chunks=n_chunks)
+    index_chunks = np.empty((len(indices),) + first_chunks.shape,
+                            dtype=first_chunks.dtype)
+    index_chunks[0] = first_chunks
+    del first_chunks
+    for index_n in range(1, len(indices)):
+        split_array(array=indices[index_n], n_chunks=n_chunks,
+                    out=index_chunks[index_n])
     tci_chunks = split_array(array=tci_array, n_chunks=n_chunks)
+    # the chunked copy is all that steps 6-7 use, so drop the full-size
+    # original rather than holding the image in memory twice
+    del tci_array
+
+    if label_data:
+        # precompute the per-chunk maxima here so that the labelling loop
+        # in step 6 does not pay for two nanmax reductions on every chunk
+        # the user is shown; one reshaped reduction covers both indices
+        max_ndwi, max_mndwi = np.nanmax(
+            index_chunks[:2].reshape(2, index_chunks.shape[1], -1), axis=2)
     end_spinner(stop_event, thread)
     
     # %%%% 5.3 Preparing File for Labelling
@@ -286,105 +325,104 @@ def get_sat(sat_name, sat_number, folder):
     checked directly before this step, as well as any blank entries. Although 
     this may seem an excessive step to perform every time, it is necessary to 
     ensure that the file data is exactly as it should be. 
-    All these checks are carried out in 'read-only' mode unless the user 
-    specifies otherwise. This is to make sure that the data is not accidentally 
-    overwritten at any point, again, unless the user is sure this is the 
-    intended behaviour."""
-    stop_event, thread = start_spinner(message="preparing file for labelling")
-    while True:
-        # file will always exist due to blank_entry_check call
-        with open(data_file, "r") as file:
-            lines = file.readlines()
-        try:
-            # Validate file data
-            for i in range(1, len(lines) - 1):
-                current_chunk = int(lines[i].split(",")[0])
-                next_chunk = int(lines[i+1].split(",")[0])
-                if next_chunk - current_chunk != 1:
+    All these checks are carried out in 'read-only' mode unless the user
+    specifies otherwise. This is to make sure that the data is not accidentally
+    overwritten at any point, again, unless the user is sure this is the
+    intended behaviour. Headless runs (label_data set to False) never touch
+    the file beyond the blank-entry sweep above, so both the validity and
+    completion checks are skipped entirely."""
+    if label_data:
+        stop_event, thread = start_spinner(
+            message="preparing file for labelling")
+        while True:
+            # file will always exist due to blank_entry_check call
+            with open(data_file, "r") as file:
+                lines = file.readlines()
+            try:
+                # Validate file data: chunk numbers must increase by
+                # exactly one per line, which np.diff checks in a single
+                # vectorised pass
+                chunk_ids = np.fromiter(
+                    (int(line.split(",", 1)[0]) for line in lines[1:]),
+                    dtype=np.int32)
+                gaps = np.nonzero(np.diff(chunk_ids) != 1)[0]
+                if gaps.size > 0:
                     end_spinner(stop_event, thread)
-                    print(f"Line {i + 2}, expected chunk {current_chunk + 1}")
+                    print(f"Line {gaps[0] + 3}, "
+                          f"expected chunk {chunk_ids[gaps[0]] + 1}")
                     raise ValueError("File validity error")
-            last_chunk = int(lines[-1].split(",")[0])
-            break
-        except (ValueError, IndexError) as e:
-            end_spinner(stop_event, thread)
-            print(f"error - file with invalid data: {e}")
-            print("type 'quit' to exit, or 'new' for a fresh file")
-            response_time_start = time.monotonic()
-            ans = input("press enter to retry: ").strip().lower()
-            response_time += time.monotonic() - response_time_start
-            if ans.lower() == 'quit':
-                return indices
-            elif ans.lower() == 'new':
-                print("creating new file...")
-                with open(data_file, "w") as file:
-                    file.write(header)
-                    file.write("0, 1, 0\n") # dummy file to start up
-                continue
-    end_spinner(stop_event, thread)
-    
-    i = last_chunk + 1 # from this point on, "i" is off-limits as a counter
-    
-    # %%%%% 5.3.2 Data completion check
-    """Once file validity has been verified, this step is for ensuring that 
-    the data in the file is complete. While the previous step (5.3.1) was 
-    mostly intended for checking that the chunks are in the correct order, 
-    this step additionally checks that the chunks that are supposed to have 
-    data, i.e. a chunk is noted as containing a reservoir, that there are 
-    coordinates outlining that reservoir. If this is not the case, the 
-    'data_correction' mode is activated, in which the user is prompted to 
-    essentially fill in the coordinates that should exist in the place where 
-    a chunk is supposed to contain some water body."""
-    # find chunks with invalid or incomplete reservoir coordinate data
-    reservoir_rows = []
-    body_rows = []
-    invalid_rows = []
-    data_correction = False
-    
-    with open(data_file, "r") as file:
-        lines = file.readlines() # reread lines in case of changes
-        globals()["lines"] = lines
-    for j in range(1, len(lines)): # starting from the "headers" line
-        # check for reservoirs without coordinates
-        num_of_reservoirs = int(lines[j].split(",")[1])
-        try: # try to access coordinates
-            res_coord = lines[j].split(",")[3]
-            if res_coord[0] == "[":
-                res_has_coords = True
-            else:
-                res_has_coords = False
-        except: # if unable to access, they do not exist
-            res_has_coords = False
-        if num_of_reservoirs != 0 and not res_has_coords:
-            reservoir_rows.append(j-1)
-            data_correction = True
-        elif num_of_reservoirs == 0 and res_has_coords:
-            invalid_rows.append(j-1)
-            data_correction = True
-        
-        # check for non-reservoir water bodies without coordinates
-        num_of_bodies = int(lines[j].split(",")[2])
-        try: # try to access coordinates
-            body_coord = lines[j].split(",")[8]
-            if body_coord[0] == "[":
-                body_has_coords = True
-            else:
-                body_has_coords = False
-        except: # if unable to access, they do not exist
-            body_has_coords = False
-        if num_of_bodies != 0 and not body_has_coords:
-            body_rows.append(j-1)
-            data_correction = True
-        elif num_of_bodies == 0 and body_has_coords:
-            invalid_rows.append(j-1)
-            data_correction = True
-    invalid_rows = combine_sort_unique(reservoir_rows, body_rows, invalid_rows)
-    
-    if data_correction:
-        print(f"found {len(invalid_rows)} chunks containing "
-               "incomplete, missing, or incorrect coordinate data")
-        i = invalid_rows[0]
-        invalid_rows_index = 0
+                last_chunk = int(chunk_ids[-1])
+                break
+            except (ValueError, IndexError) as e:
+                end_spinner(stop_event, thread)
+                print(f"error - file with invalid data: {e}")
+                print("type 'quit' to exit, or 'new' for a fresh file")
+                ans, elapsed = timed_input("press enter to retry: ")
+                ans = ans.strip().lower()
+                response_time += elapsed
+                if ans.lower() == 'quit':
+                    return indices, response_time
+                elif ans.lower() == 'new':
+                    print("creating new file...")
+                    with open(data_file, "w") as file:
+                        file.write(header)
+                        file.write("0, 1, 0\n") # dummy file to start up
+                    continue
+        end_spinner(stop_event, thread)
+
+        i = last_chunk + 1 # from here on, "i" is off-limits as a counter
+
+        # %%%%% 5.3.2 Data completion check
+        """Once file validity has been verified, this step is for ensuring
+        that the data in the file is complete. While the previous step
+        (5.3.1) was mostly intended for checking that the chunks are in the
+        correct order, this step additionally checks that the chunks that
+        are supposed to have data, i.e. a chunk is noted as containing a
+        reservoir, that there are coordinates outlining that reservoir. If
+        this is not the case, the 'data_correction' mode is activated, in
+        which the user is prompted to essentially fill in the coordinates
+        that should exist in the place where a chunk is supposed to contain
+        some water body."""
+        # find chunks with invalid or incomplete reservoir coordinate data
+        reservoir_rows = []
+        body_rows = []
+        invalid_rows = []
+        data_correction = False
+
+        with open(data_file, "r") as file:
+            lines = file.readlines() # reread lines in case of changes
+            globals()["lines"] = lines
+        # split each line once, instead of re-splitting it for every field
+        rows = [line.split(",") for line in lines[1:]] # skip "headers" line
+        for j, row in enumerate(rows):
+            # check for reservoirs without coordinates
+            num_of_reservoirs = int(row[1])
+            # coordinates either start with "[" or do not exist at all
+            res_has_coords = len(row) > 3 and row[3].startswith("[")
+            if num_of_reservoirs != 0 and not res_has_coords:
+                reservoir_rows.append(j)
+                data_correction = True
+            elif num_of_reservoirs == 0 and res_has_coords:
+                invalid_rows.append(j)
+                data_correction = True
+
+            # check for non-reservoir water bodies without coordinates
+            num_of_bodies = int(row[2])
+            body_has_coords = len(row) > 8 and row[8].startswith("[")
+            if num_of_bodies != 0 and not body_has_coords:
+                body_rows.append(j)
+                data_correction = True
+            elif num_of_bodies == 0 and body_has_coords:
+                invalid_rows.append(j)
+                data_correction = True
+        invalid_rows = combine_sort_unique(reservoir_rows, body_rows,
+                                           invalid_rows)
+
+        if data_correction:
+            print(f"found {len(invalid_rows)} chunks containing "
+                   "incomplete, missing, or incorrect coordinate data")
+            i = invalid_rows[0]
+            invalid_rows_index = 0
     time_taken = time.monotonic() - start_time - response_time
     print(f"step 5 complete! time taken: {round(time_taken, 2)} seconds")
     
@@ -400,20 +438,25 @@ def get_sat(sat_name, sat_number, folder):
         
         # %%%% 6.1 Outputting Images
         print("outputting images...")
-        
-        while i < len(index_chunks[0]):
+
+        # scan for blank entries once up front; inside the loop the file
+        # only needs rescanning straight after it has been written to
+        blank_entry_check(file=data_file)
+
+        # hoisted out of the loop: the chunk count never changes mid-session
+        total_chunks = len(index_chunks[0])
+        while i < total_chunks:
             if break_flag:
                 break
             plot_chunks(ndwi, mndwi, index_chunks, plot_size_chunks, i, 
                         title_size, label_size, tci_chunks, tci_60_array)
             max_index = [0, 0]
-            max_index[0] = round(np.nanmax(index_chunks[0][i]), 2)
+            max_index[0] = round(max_ndwi[i], 2)
             print(f"MAX {index_labels[0]}: {max_index[0]}", end=" | ")
-            max_index[1] = round(np.nanmax(index_chunks[1][i]), 2)
+            max_index[1] = round(max_mndwi[i], 2)
             print(f"MAX {index_labels[1]}: {max_index[1]}")
             
             # %%%% 6.2 User Labelling
-            blank_entry_check(file=data_file)
             response_time_start = time.monotonic()
             if data_correction:
                 print((
@@ -428,7 +471,6 @@ def get_sat(sat_name, sat_number, folder):
             n_bodies = ""
             entry_list = []
             while True:
-                blank_entry_check(file=data_file)
                 back_flag = False
                 try:
                     # %%%%% 6.2.1 Regular integer response
@@ -444,8 +486,9 @@ def get_sat(sat_name, sat_number, folder):
                         print("please draw a square around the reservoir(s)", 
                               flush=True)
                         chunk_coords = prompt_roi(tci_chunks[i], n_reservoirs)
-                        for coord in chunk_coords:
-                            entry_list.append(coord)
+                        # extend keeps each row as-is, so the coordinates
+                        # still format as "[x y x y]" in the csv entry
+                        entry_list.extend(chunk_coords)
                     while len(entry_list) < 8:
                         entry_list.append("")
                     
@@ -458,8 +501,7 @@ def get_sat(sat_name, sat_number, folder):
                         print("please draw a square around the water bodies", 
                               flush=True)
                         chunk_coords = prompt_roi(tci_chunks[i], n_bodies)
-                        for coord in chunk_coords:
-                            entry_list.append(coord)
+                        entry_list.extend(chunk_coords)
                     response_time += time.monotonic() - response_time_start
                     i += 1
                     print("generating next chunk...", flush=True)
@@ -489,12 +531,15 @@ def get_sat(sat_name, sat_number, folder):
                             n_backs = 1
                         i -= n_backs
                         check_file_permission(file_name=data_file)
+                        # undoing only ever removes whole lines from the
+                        # end, so drop them as raw text instead of parsing
+                        # and re-serialising the entire csv
                         with open(data_file, mode="r") as re: # read
-                            rows = list(csv.reader(re))
-                        for j in range(n_backs):
-                            rows.pop() # remove the last "n_backs" rows
+                            file_lines = re.readlines()
+                        del file_lines[-n_backs:]
                         with open(data_file, mode="w") as wr: # write
-                            rewrite(write_file=wr, rows=rows)
+                            wr.writelines(file_lines)
+                        blank_entry_check(file=data_file)
                         break
                     else:
                         # %%%%% 6.2.4 Non-integer response: error
@@ -511,20 +556,11 @@ def get_sat(sat_name, sat_number, folder):
                 break
             elif not break_flag and not back_flag:
                 check_file_permission(file_name=data_file)
-                csv_entry = ""
-                first_csv_entry = True
-                for entry in entry_list:
-                    if first_csv_entry:
-                        csv_entry = f"{entry}"
-                    elif not first_csv_entry:
-                        csv_entry = f"{csv_entry},{entry}"
-                    first_csv_entry = False
+                csv_entry = ",".join(str(entry) for entry in entry_list)
                 if data_correction: # add coordinates to data
                     lines[i] = f"{csv_entry}\n"
                     with open(data_file, mode="w") as wr: # write
-                        for j in range(len(lines)):
-                            current_entry = lines[j]
-                            wr.write(f"{current_entry}")
+                        wr.writelines(lines)
                     invalid_rows_index += 1
                     if invalid_rows_index >= len(invalid_rows):
                         i = last_chunk + 1
@@ -533,7 +569,8 @@ def get_sat(sat_name, sat_number, folder):
                         i = invalid_rows[invalid_rows_index]
                 else: # convert entry_list to a string for csv
                     with open(data_file, mode="a") as ap: # append
-                        ap.write(f"\n{csv_entry}")
+                        ap.write("\n" + csv_entry)
+                blank_entry_check(file=data_file)
         print(f"responding time: {round(response_time, 2)} seconds")            
         time_taken = time.monotonic() - start_time - response_time
         print(f"step 6 complete! time taken: {round(time_taken, 2)} seconds")
@@ -551,19 +588,28 @@ def get_sat(sat_name, sat_number, folder):
         print("exiting program")
         #return indices
     stop_event, thread = start_spinner(message="coordinate extraction")
+    """The chunk numbers and bounding boxes are collected in parallel lists
+    (one per category) and converted to numpy arrays afterwards, rather than
+    keeping a list of (chunk, coordinates) tuples per category. This
+    structure-of-arrays layout keeps the boxes in one contiguous (N, 4)
+    array that step 7.2 can index straight into."""
     res_rows = []
-    res_coords = []
-    
+    res_chunk_ids = []
+    res_boxes = []
+
     body_rows = []
-    body_coords = []
-    
+    body_chunk_ids = []
+    body_boxes = []
+
     land_rows = []
-    land_coords = []
+    land_chunk_ids = []
+    land_boxes = []
     none_coord = "[50.0 50.0 55.0 55.0]" # replicate res and bod coords format
     # allows it to be passed as an argument of extract_coords
-    
+
     sea_rows = []
-    sea_coords = []
+    sea_chunk_ids = []
+    sea_boxes = []
     
     with open(data_file, "r") as file:
         lines = file.readlines()
@@ -574,39 +620,52 @@ def get_sat(sat_name, sat_number, folder):
             res_rows.append(lines[i])
             if int(res_rows[-1][1]) > 1:
                 for j in range(3, 3+int(res_rows[-1][1])):
-                    res_coords.append((i, extract_coords(res_rows[-1][j], 
-                                                         create_box_flag=True)))
+                    res_chunk_ids.append(i)
+                    res_boxes.append(extract_coords(res_rows[-1][j],
+                                                    create_box_flag=True))
             elif int(res_rows[-1][1]) == 1:
-                res_coords.append((i, extract_coords(res_rows[-1][3], 
-                                                     create_box_flag=True)))
-        
+                res_chunk_ids.append(i)
+                res_boxes.append(extract_coords(res_rows[-1][3],
+                                                create_box_flag=True))
+
         # if there is a water body
         if int(lines[i][2]) > 0:
             body_rows.append(lines[i])
-            first_coords = extract_coords(body_rows[-1][8], 
+            first_coords = extract_coords(body_rows[-1][8],
                                           create_box_flag=False)
             # and the water body is not the sea
             if first_coords[0] != 0 and first_coords[-1] != 157:
                 if int(body_rows[-1][2]) > 1:
                     for j in range(8, 8+int(body_rows[-1][2])):
-                        this_coord = extract_coords(body_rows[-1][j], 
-                                                    create_box_flag=True)
-                        body_coords.append((i, this_coord))
+                        body_chunk_ids.append(i)
+                        body_boxes.append(extract_coords(body_rows[-1][j],
+                                                         create_box_flag=True))
                 elif int(body_rows[-1][2]) == 1:
-                    this_coord = extract_coords(body_rows[-1][8], 
-                                                  create_box_flag=True)
-                    body_coords.append((i, this_coord))
+                    body_chunk_ids.append(i)
+                    body_boxes.append(extract_coords(body_rows[-1][8],
+                                                     create_box_flag=True))
             else:# if it IS the sea, save a minichunk of it too
                 sea_rows.append(lines[i])
-                sea_coords.append((i, extract_coords(none_coord, 
-                                                  create_box_flag=True)))
-        
+                sea_chunk_ids.append(i)
+                sea_boxes.append(extract_coords(none_coord,
+                                                create_box_flag=True))
+
         # if it's just land, save a minichunk of it too
         if int(lines[i][1]) == 0 and int(lines[i][2]) == 0:
             land_rows.append(lines[i])
-            land_coords.append((i, extract_coords(none_coord, 
-                                                  create_box_flag=True)))
-    
+            land_chunk_ids.append(i)
+            land_boxes.append(extract_coords(none_coord,
+                                             create_box_flag=True))
+
+    res_chunk_ids = np.asarray(res_chunk_ids, dtype=np.int32)
+    res_boxes = np.asarray(res_boxes, dtype=np.float32)
+    body_chunk_ids = np.asarray(body_chunk_ids, dtype=np.int32)
+    body_boxes = np.asarray(body_boxes, dtype=np.float32)
+    land_chunk_ids = np.asarray(land_chunk_ids, dtype=np.int32)
+    land_boxes = np.asarray(land_boxes, dtype=np.float32)
+    sea_chunk_ids = np.asarray(sea_chunk_ids, dtype=np.int32)
+    sea_boxes = np.asarray(sea_boxes, dtype=np.float32)
+
     globals()["lines"] = lines
     end_spinner(stop_event, thread)
     
@@ -614,12 +673,12 @@ def get_sat(sat_name, sat_number, folder):
     """nico!! remember to add a description! 0.4*max to bring down the ceiling 
     of ndwi so that reservoir and water bodies are better highlighted"""
     ndwi_chunks = index_chunks[0]
-    valid_chunks = [chunk
-                    for chunk in ndwi_chunks
-                    if not np.all(np.isnan(chunk))]
-    if valid_chunks:
-        global_min = min(np.nanmin(chunk) for chunk in valid_chunks)
-        global_max = 0.4*max(np.nanmax(chunk) for chunk in valid_chunks)
+    # the chunks sit in one contiguous array, so a single nanmin/nanmax
+    # over it replaces the per-chunk Python reductions (and the list of
+    # valid chunks that only existed to dodge all-NaN warnings)
+    if not np.all(np.isnan(ndwi_chunks)):
+        global_min = np.nanmin(ndwi_chunks)
+        global_max = 0.4*np.nanmax(ndwi_chunks)
     else:
         global_min = np.nan
         print("Warning: All NDWI chunks contained only NaN values.")
@@ -627,9 +686,9 @@ def get_sat(sat_name, sat_number, folder):
     # %%%%% 7.2.1 Create an image of each water reservoir and save it
     stop_event, thread = start_spinner(message="reservoir data segmentation")
     had_an_oopsie = False
-    for i in range(len(res_coords)):
-        chunk_n = (int(res_coords[i][0])-1)
-        
+    for i in range(len(res_chunk_ids)):
+        chunk_n = int(res_chunk_ids[i]) - 1
+
         # NDWI data
         res_ndwi_path = os.path.join(
             path, "training data", "ndwi", "reservoirs"
@@ -640,7 +699,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=ndwi_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=True, 
-                            coordinates=res_coords[i][1], 
+                            coordinates=res_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
             # TCI data
@@ -652,7 +711,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=tci_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=False, 
-                            coordinates=res_coords[i][1], 
+                            coordinates=res_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
         except:
@@ -665,8 +724,8 @@ def get_sat(sat_name, sat_number, folder):
     # %%%%% 7.2.2 Create an image of each water body and save it
     stop_event, thread = start_spinner(message="water body data segmentation")
     had_an_oopsie = False
-    for i in range(len(body_coords)):
-        chunk_n = (int(body_coords[i][0])-1)
+    for i in range(len(body_chunk_ids)):
+        chunk_n = int(body_chunk_ids[i]) - 1
         
         # NDWI data
         body_ndwi_path = os.path.join(
@@ -678,7 +737,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=ndwi_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=True, 
-                            coordinates=body_coords[i][1], 
+                            coordinates=body_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
             # TCI data
@@ -690,7 +749,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=tci_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=False, 
-                            coordinates=body_coords[i][1], 
+                            coordinates=body_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
         except:
@@ -704,8 +763,8 @@ def get_sat(sat_name, sat_number, folder):
     # %%%%# 7.3.1 Land
     stop_event, thread = start_spinner(message="land data segmentation")
     had_an_oopsie = False
-    for i in range(len(res_coords)):
-        chunk_n = (int(land_coords[i][0])-1)
+    for i in range(len(res_chunk_ids)):
+        chunk_n = int(land_chunk_ids[i]) - 1
         
         # NDWI data
         land_ndwi_path = os.path.join(
@@ -717,7 +776,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=ndwi_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=True, 
-                            coordinates=land_coords[i][1], 
+                            coordinates=land_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
             # TCI data
@@ -729,7 +788,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=tci_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=False, 
-                            coordinates=land_coords[i][1], 
+                            coordinates=land_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
         except:
@@ -742,8 +801,8 @@ def get_sat(sat_name, sat_number, folder):
     # %%%%# 7.3.2 Sea
     stop_event, thread = start_spinner(message="sea data segmentation")
     had_an_oopsie = False
-    for i in range(len(res_coords)):
-        chunk_n = (int(sea_coords[i][0])-1)
+    for i in range(len(res_chunk_ids)):
+        chunk_n = int(sea_chunk_ids[i]) - 1
         
         # NDWI data
         sea_ndwi_path = os.path.join(
@@ -755,7 +814,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=ndwi_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=True, 
-                            coordinates=sea_coords[i][1], 
+                            coordinates=sea_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
             # TCI data
@@ -767,7 +826,7 @@ def get_sat(sat_name, sat_number, folder):
             save_image_file(data=tci_chunks[chunk_n], 
                             image_name=image_name, 
                             normalise=False, 
-                            coordinates=sea_coords[i][1], 
+                            coordinates=sea_boxes[i],
                             g_min=global_min, g_max=global_max, 
                             dupe_check=True)
         except:
@@ -781,7 +840,7 @@ def get_sat(sat_name, sat_number, folder):
     print(f"step 7 complete! time taken: {round(time_taken, 2)} seconds")
     
     # %%% 8. Satellite Output
-    return indices
+    return indices, response_time
 # %% Running Functions
 """
 Sentinel 2 has varying resolution bands, with Blue (2), Green (3), Red (4), and 
@@ -789,7 +848,7 @@ NIR (8) having 10m spatial resolution, while SWIR 1 (11) and SWIR 2 (12) have
 20m spatial resolution. There is no MIR band, so MNDWI is calculated correctly 
 with the SWIR2 band. 
 """
-s2_indices = get_sat(sat_name="Sentinel", sat_number=2, 
+s2_indices, response_time = get_sat(sat_name="Sentinel", sat_number=2,
                           folder=("S2C_MSIL2A_20250301T111031_N0511_R137"
                                   "_T31UCU_20250301T152054.SAFE"))
 stop_event, thread = start_spinner(message="splitting indices")
@@ -1,6 +1,8 @@
 import csv
+import functools
 import os
 import re
+import numpy as np
 
 def rewrite(write_file, rows):
     """
@@ -190,33 +192,91 @@ def extract_coords(coord_string, create_box_flag):
       list: A list of floats representing the coordinates.
     """
     try:
-        # Remove square brackets, split the string into numeric strings
-        coord_string = coord_string.replace('[', '').replace(']', '')
-        coord_strings = coord_string.split()
-        
-        # Convert each numeric string to a float
-        coordinates = [float(coord) for coord in coord_strings]
+        # Remove square brackets, then parse every number in one C-level
+        # call rather than a Python loop of float() conversions
+        coord_string = coord_string.replace('[', ' ').replace(']', ' ')
+        coordinates = np.fromstring(coord_string, sep=" ").tolist()
         if create_box_flag:
             coordinates = create_box(coordinates)
     except:
         coordinates = []
     return coordinates
 
+def parse_sentinel_folder(folder):
+    """
+    Deconstruct a Sentinel 2 .SAFE folder name into its useful parts.
+
+    Every pipeline pulls the tile number and the datatake start sensing
+    time out of the folder title, both on their own and joined into the
+    prefix that the band file names inside the folder start with. The
+    underscore split is spelled out once here instead of every script
+    naming all seven fields itself.
+
+    Parameters
+    ----------
+    folder : string
+        The name of a Sentinel 2 .SAFE folder.
+
+    Returns
+    -------
+    tile_number_field : string
+        The tile number field, e.g. "T31UCU".
+    datatake_start_sensing_time : string
+        The datatake start sensing time field.
+    prefix : string
+        The tile number and sensing time joined with an underscore, which
+        is the prefix every band image file name starts with.
+
+    """
+    (sentinel_name, instrument_and_product_level,
+     datatake_start_sensing_time, processing_baseline_number,
+     relative_orbit_number, tile_number_field,
+     product_discriminator_and_format) = folder.split("_")
+    prefix = f"{tile_number_field}_{datatake_start_sensing_time}"
+    return tile_number_field, datatake_start_sensing_time, prefix
+
 def change_to_folder(folder_path):
     if os.path.exists(folder_path):
         os.chdir(folder_path)
     else:
         os.makedirs(folder_path)
         os.chdir(folder_path)
-        path_name = folder_path.split("\\")
-        print(f"created folder named '{path_name[-1]}' in '{path_name[-2]}'")
+        parent_path, folder_name = os.path.split(folder_path)
+        print(f"created folder named '{folder_name}' "
+              f"in '{os.path.basename(parent_path)}'")
+
+@functools.lru_cache(maxsize=None)
+def find_granule_subdirs(granule_path):
+    """
+    List the subdirectories inside a Sentinel 2 GRANULE folder.
+
+    The single subfolder inside GRANULE has an unpredictable name, so it has
+    to be found by listing the folder. The result is cached per path because
+    directory listings can cost tens of milliseconds on OneDrive-synced
+    drives and the answer never changes within a session.
+
+    Parameters
+    ----------
+    granule_path : string
+        The file path to the GRANULE folder.
+
+    Returns
+    -------
+    subdirs : tuple
+        The names of every subdirectory found in the GRANULE folder.
+
+    """
+    # scandir's DirEntry carries the file type from the listing itself, so
+    # this avoids a separate stat call per entry that isdir would make
+    with os.scandir(granule_path) as entries:
+        return tuple(entry.name for entry in entries if entry.is_dir())
 
 def check_duplicate_name(search_dir, file_name):
-    duplicates = False
-    for files in os.listdir(search_dir):
-        if file_name in files:
-            duplicates = True
-    return duplicates
+    with os.scandir(search_dir) as entries:
+        for entry in entries:
+            if file_name in entry.name:
+                return True
+    return False
 
 def extract_chunk_details(filename, pattern):
     base_name = os.path.splitext(os.path.basename(str(filename)))[0]
@@ -17,6 +17,15 @@ from tensorflow import keras
 from tensorflow.keras import layers
 from tensorflow.keras.models import Sequential
 
+# mixed float16 roughly doubles conv/matmul throughput on tensor-core
+# GPUs; on a CPU-only run it only adds casts, so gate it on GPU presence
+if tf.config.list_physical_devices("GPU"):
+    tf.keras.mixed_precision.set_global_policy("mixed_float16")
+
+# channels_last is the default, but pinning it guards against a stray
+# ~/.keras config flipping the conv layout away from cuDNN's fast path
+keras.backend.set_image_data_format("channels_last")
+
 # %%% ii. Import Internal Functions
 # Make sure these files are accessible in your Python environment
 try:
@@ -195,7 +204,8 @@ def build_compile_model(num_classes, learning_rate, dropout_rate):
       layers.Dropout(dropout_rate), # Use passed dropout rate
       layers.Flatten(), #
       layers.Dense(128, activation='relu'), #
-      layers.Dense(num_classes, name="outputs") # Output layer (logits)
+      # float32 output keeps the logits stable under mixed precision
+      layers.Dense(num_classes, name="outputs", dtype="float32") # Output layer (logits)
     ], name=f"{MODEL_TYPE}_classifier_{int(time.time())}") # Add timestamp for unique name #
 
     # Compile the model #
@@ -373,7 +383,9 @@ if 'model' in locals() and model is not None: # Check if model exists
             img_array = tf.keras.utils.img_to_array(img) #
             img_array = tf.expand_dims(img_array, 0) # Create a batch #
 
-            predictions = model.predict(img_array) #
+            # direct call skips model.predict's per-call dataset setup,
+            # which dominates for a single image
+            predictions = model(img_array, training=False).numpy() #
             score = tf.nn.softmax(predictions[0]) #
 
             predicted_class_index = np.argmax(score) #
@@ -1,10 +1,22 @@
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+# OpenJPEG 2.2+ decodes JP2 tiles on multiple threads, but it only reads
+# this variable when the library loads, so it must be set before PIL is
+# imported anywhere in the program
+os.environ.setdefault("OPJ_NUM_THREADS", str(os.cpu_count() or 1))
 from PIL import Image
 from matplotlib import pyplot as plt
 from matplotlib import colors
 from data_handling import check_duplicate_name
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 def image_to_array(file_path_s):
     """
     Convert an image or list of images to a numpy array. The image is opened 
@@ -27,15 +39,166 @@ def image_to_array(file_path_s):
     """
     if not isinstance(file_path_s, list):
         with Image.open(file_path_s) as img:
-            image_array = np.array(img)
+            # load then wrap without copying, rather than np.array which
+            # would buffer the decoded band a second time
+            img.load()
+            image_array = np.asarray(img)
         return image_array
     else:
-        image_arrays = []
-        for file_path in file_path_s:
-            with Image.open(file_path) as img:
-                image_arrays.append(np.array(img))
+        # the JP2 decoder releases the GIL, so decoding each band on its own
+        # thread overlaps the expensive decompression work across cores
+        with ThreadPoolExecutor(max_workers=len(file_path_s)) as executor:
+            image_arrays = list(executor.map(_decode_band, file_path_s))
         return image_arrays
 
+def _decode_band(file_path):
+    """
+    Decode one band image, reusing an on-disk cached copy when available.
+
+    JP2 decompression dominates the first run over a new satellite image,
+    and the decoded pixels never change, so the raw array is saved to a
+    '.band_cache' folder next to the source file and loaded directly on
+    later runs. The source file's modification time is part of the cache
+    file name, so a re-downloaded image can never match a stale cache.
+
+    Parameters
+    ----------
+    file_path : string
+        The file path to a single band image file.
+
+    Returns
+    -------
+    image_array : numpy array
+        The decoded image as a writable numpy array.
+
+    """
+    source_dir, source_name = os.path.split(file_path)
+    cache_dir = os.path.join(source_dir, ".band_cache")
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    cache_path = os.path.join(cache_dir, f"{source_name}.{mtime_ns}.npy")
+    if os.path.exists(cache_path):
+        return np.load(cache_path)
+    with Image.open(file_path) as img:
+        # bands must stay writable (the cloud mask zeroes pixels in
+        # place), so this path keeps the copying np.array
+        image_array = np.array(img)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_path, image_array)
+    except OSError:
+        pass # a read-only image folder just means no cache this session
+    return image_array
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _indices_kernel(blue, green, nir, swir1, swir2,
+                        ndwi, mndwi, awei_sh, awei_nsh):
+        """Fused per-pixel kernel behind get_indices: one pass over the
+        bands computes all four indices in registers, roughly a quarter of
+        the memory traffic of the equivalent chain of numpy ufuncs."""
+        b = blue.ravel()
+        g = green.ravel()
+        n = nir.ravel()
+        s1 = swir1.ravel()
+        s2 = swir2.ravel()
+        o_ndwi = ndwi.ravel()
+        o_mndwi = mndwi.ravel()
+        o_awei_sh = awei_sh.ravel()
+        o_awei_nsh = awei_nsh.ravel()
+        for k in prange(g.size):
+            bv = b[k]
+            gv = g[k]
+            nv = n[k]
+            s1v = s1[k]
+            s2v = s2[k]
+            denom = gv + nv
+            o_ndwi[k] = (gv - nv) / denom if denom != 0 else np.nan
+            denom = gv + s1v
+            o_mndwi[k] = (gv - s1v) / denom if denom != 0 else np.nan
+            o_awei_sh[k] = (gv + 2.5 * bv - 1.5 * (nv + s1v)
+                            - 0.25 * s2v)
+            o_awei_nsh[k] = 4.0 * (gv - s1v) - (0.25 * nv + 2.75 * s2v)
+
+def get_indices(blue, green, nir, swir1, swir2):
+    """
+    Calculate every water index (NDWI, MNDWI, AWEI-SH, AWEI-NSH) in a single
+    pass over the band arrays. The outputs are preallocated as float32 arrays
+    and every operation writes into them directly, so no full-resolution
+    temporary arrays are created. Pixels where an index denominator is zero
+    are set to not-a-number instead of relying on numpy error suppression.
+
+    Parameters
+    ----------
+    blue : numpy array
+        The blue band image array.
+    green : numpy array
+        The green band image array.
+    nir : numpy array
+        The near-infrared band image array.
+    swir1 : numpy array
+        The short-wave infrared 1 band image array.
+    swir2 : numpy array
+        The short-wave infrared 2 band image array.
+
+    Returns
+    -------
+    ndwi : numpy array
+        The normalised difference water index array.
+    mndwi : numpy array
+        The modified normalised difference water index array.
+    awei_sh : numpy array
+        The automated water extraction index (shadow) array.
+    awei_nsh : numpy array
+        The automated water extraction index (no shadow) array.
+
+    """
+    ndwi = np.empty(green.shape, dtype=np.float32)
+    mndwi = np.empty(green.shape, dtype=np.float32)
+    awei_sh = np.empty(green.shape, dtype=np.float32)
+    awei_nsh = np.empty(green.shape, dtype=np.float32)
+
+    # numba is optional: when installed, the fused kernel computes all four
+    # indices in a single parallel pass over the bands
+    if NUMBA_AVAILABLE:
+        _indices_kernel(blue, green, nir, swir1, swir2,
+                        ndwi, mndwi, awei_sh, awei_nsh)
+        return ndwi, mndwi, awei_sh, awei_nsh
+
+    # one scratch buffer shared by the denominators and the scaled bands, so
+    # no expression below allocates a full-resolution temporary
+    scratch = np.empty(green.shape, dtype=np.float32)
+
+    # NDWI = (green - nir) / (green + nir)
+    np.add(green, nir, out=scratch)
+    np.subtract(green, nir, out=ndwi)
+    np.divide(ndwi, scratch, out=ndwi, where=scratch != 0)
+    ndwi[scratch == 0] = np.nan
+
+    # MNDWI = (green - swir1) / (green + swir1)
+    np.add(green, swir1, out=scratch)
+    np.subtract(green, swir1, out=mndwi)
+    np.divide(mndwi, scratch, out=mndwi, where=scratch != 0)
+    mndwi[scratch == 0] = np.nan
+
+    # AWEI-SH = green + 2.5*blue - 1.5*(nir + swir1) - 0.25*swir2
+    np.add(nir, swir1, out=awei_sh)
+    np.multiply(awei_sh, -1.5, out=awei_sh)
+    awei_sh += green
+    np.multiply(blue, 2.5, out=scratch)
+    awei_sh += scratch
+    np.multiply(swir2, 0.25, out=scratch)
+    awei_sh -= scratch
+
+    # AWEI-NSH = 4*(green - swir1) - (0.25*nir + 2.75*swir2)
+    np.subtract(green, swir1, out=awei_nsh)
+    np.multiply(awei_nsh, 4.0, out=awei_nsh)
+    np.multiply(nir, 0.25, out=scratch)
+    awei_nsh -= scratch
+    np.multiply(swir2, 2.75, out=scratch)
+    awei_nsh -= scratch
+
+    return ndwi, mndwi, awei_sh, awei_nsh
+
 def upscale_image_array(img_array, factor=2):
     """
     An image, for example the band image for SWIR1 or SWIR2 may be of lower 
@@ -56,9 +219,34 @@ def upscale_image_array(img_array, factor=2):
         The 20m resolution image array is upscaled to match the 10m reoslution.
     
     """
-    return np.repeat(np.repeat(img_array, factor, axis=0), factor, axis=1)
+    # a broadcast view duplicates each pixel along both axes without the
+    # intermediate full-size copy that chaining two np.repeat calls makes;
+    # the single reshape at the end is the only pass over the output
+    height, width = img_array.shape[:2]
+    expanded = np.broadcast_to(
+        img_array[:, np.newaxis, :, np.newaxis],
+        (height, factor, width, factor) + img_array.shape[2:])
+    return expanded.reshape((height * factor, width * factor)
+                            + img_array.shape[2:])
+
+# 256-entry table mapping a uint8 cloud probability to "is cloud"; the
+# whole table sits in one cache line pair, so indexing it is cheaper than
+# running a full-image comparison kernel
+_CLOUD_PRB_LUT = np.arange(256, dtype=np.uint8) > 50
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _mask_band_kernel(band, clouds, factor):
+        """Zero the cloud pixels of one band in place, reading the cloud
+        probability raster at its own (coarser) resolution - the upscaled
+        cloud copy and the boolean mask are never materialised."""
+        for y in prange(band.shape[0]):
+            cloud_row = clouds[y // factor]
+            for x in range(band.shape[1]):
+                if cloud_row[x // factor] > 50:
+                    band[y, x] = 0
 
-def mask_sentinel(path, high_res, image_arrays):
+def mask_sentinel(path, high_res, image_arrays, clouds_array=None):
     """
     Start by opening the cloud probability file from Sentinel 2 imagery data 
     and converting this image into an array. Turn every pixel that is more 
@@ -79,8 +267,12 @@ def mask_sentinel(path, high_res, image_arrays):
         some images only have 20m resolution e.g. SWIR1 and SWIR2) or 60m 
         (which is the case when high_res is set to False). 
     image_arrays : list of numpy arrays
-        A list containing some number of numpy arrays converted from images. 
-    
+        A list containing some number of numpy arrays converted from images.
+    clouds_array : numpy array, optional
+        A pre-decoded cloud probability array at the resolution matching
+        high_res. Passing one lets the caller decode it in parallel with
+        the band images; when omitted it is decoded here as before.
+
     Returns
     -------
     image_arrays : list of numpy arrays
@@ -93,23 +285,49 @@ def mask_sentinel(path, high_res, image_arrays):
         if high_res:
             image_arrays[-1] = upscale_image_array(image_arrays[-1], factor=2)
             image_arrays[-2] = upscale_image_array(image_arrays[-2], factor=2)
-            path = os.path.join(path, "MSK_CLDPRB_20m.jp2")
-            clouds_array = image_to_array(path)
-            clouds_array = upscale_image_array(clouds_array, factor=2)
+            if clouds_array is None:
+                path = os.path.join(path, "MSK_CLDPRB_20m.jp2")
+                clouds_array = image_to_array(path)
+            clouds_factor = 2
         else:
-            path = os.path.join(path, "MSK_CLDPRB_60m.jp2")
-            clouds_array = image_to_array(path)
+            if clouds_array is None:
+                path = os.path.join(path, "MSK_CLDPRB_60m.jp2")
+                clouds_array = image_to_array(path)
+            clouds_factor = 1
     else: # for KRISP (where only green and NIR are used)
-        path = os.path.join(path, "MSK_CLDPRB_20m.jp2")
-        clouds_array = image_to_array(path)
-        clouds_array = upscale_image_array(clouds_array, factor=2)
-    
-    clouds_array = np.where(clouds_array > 50, 100, clouds_array)
-    cloud_positions = np.argwhere(clouds_array == 100)
-    
-    for image_array in image_arrays:
-        image_array[cloud_positions[:, 0], cloud_positions[:, 1]] = 0
-    
+        if clouds_array is None:
+            path = os.path.join(path, "MSK_CLDPRB_20m.jp2")
+            clouds_array = image_to_array(path)
+        clouds_factor = 2
+
+    if NUMBA_AVAILABLE:
+        # the fused kernel reads the probability raster at its native
+        # resolution and zeroes straight into each band, so neither the
+        # upscaled cloud copy nor the boolean mask is ever built
+        for image_array in image_arrays:
+            _mask_band_kernel(image_array, clouds_array, clouds_factor)
+        return image_arrays
+
+    if clouds_factor > 1:
+        clouds_array = upscale_image_array(clouds_array,
+                                           factor=clouds_factor)
+
+    # one boolean mask covers the whole "promote to 100% then find the
+    # positions" dance - anything over 50% likely is treated as cloud
+    if clouds_array.dtype == np.uint8:
+        cloud_mask = _CLOUD_PRB_LUT[clouds_array]
+    else:
+        cloud_mask = clouds_array > 50
+    if cloud_mask.mean() < 0.05:
+        # a nearly clear scene: a short flat index list is cheaper to
+        # apply per band than rescanning the full boolean mask each time
+        cloud_idx = np.flatnonzero(cloud_mask)
+        for image_array in image_arrays:
+            np.put(image_array, cloud_idx, 0)
+    else:
+        for image_array in image_arrays:
+            np.putmask(image_array, cloud_mask, 0)
+
     return image_arrays
 
 def plot_indices(data, sat_n, size, dpi, save_image, res):
@@ -142,45 +360,57 @@ def plot_indices(data, sat_n, size, dpi, save_image, res):
     
     """
     indices = ["NDWI", "MNDWI", "AWEI-SH", "AWEI-NSH"]
+    if sat_n != 2:
+        sat_name = "Landsat"
+        sat_letter = "L"
+    else:
+        sat_name = "Sentinel"
+        sat_letter = "S"
+
+    # one figure with a subplot per index replaces a figure per index -
+    # matplotlib pays its renderer and font setup per figure, and the old
+    # loop paid it four times to draw content into only one of them
+    fig, axes = plt.subplots(1, len(data), figsize=size)
+    fig.suptitle(f"{sat_name} {sat_n} DPI{dpi} R{res}", fontsize=8)
     for i, water_index in enumerate(data):
-        plt.figure(figsize=(size))
-        if sat_n != 2:
-            sat_name = "Landsat"
-            sat_letter = "L"
-        else:
-            sat_name = "Sentinel"
-            sat_letter = "S"
-        if i == 0:
-            plt.title(f"{sat_name} {sat_n} {indices[i]} DPI{dpi} R{res}", 
-                      fontsize=8)
-            
-            ax = plt.gca()
-            plt.imshow(water_index)
-            
-            ax.spines["left"].set_visible(False)
-            ax.spines["bottom"].set_visible(False)
-            ax.tick_params(left=False, bottom=False, 
-                           labelleft=False, labelbottom=False)
-        
-        if save_image:
-            print(f"saving {indices[i]} image", end="... ")
-            plot_name = f"{sat_letter}{sat_n}_{indices[i]}_DPI{dpi}_R{res}.png"
-            
-            # check for file name already existing and increment file name
-            base_name, extension = os.path.splitext(plot_name)
-            counter = 1
-            while os.path.exists(plot_name):
-                plot_name = f"{base_name}_{counter}{extension}"
-                counter += 1
-            
-            plt.savefig(plot_name, dpi=dpi, bbox_inches="tight")
-            print(f"complete! saved as {plot_name}")
-        
-        print(f"displaying {indices[i]} image", end="... ")
-        plt.show()
-        print(f"{indices[i]} image display complete!")
+        ax = axes[i]
+        ax.set_title(indices[i], fontsize=8)
+        # handing imshow explicit limits keeps matplotlib from running
+        # its own masked-array autoscale over the full-resolution index,
+        # and interpolation "none" skips the display resampling pass
+        ax.imshow(water_index, vmin=np.nanmin(water_index),
+                  vmax=np.nanmax(water_index), interpolation="none")
+        ax.spines["left"].set_visible(False)
+        ax.spines["bottom"].set_visible(False)
+        ax.tick_params(left=False, bottom=False,
+                       labelleft=False, labelbottom=False)
+
+    if save_image:
+        print("saving index images", end="... ")
+        plot_name = f"{sat_letter}{sat_n}_indices_DPI{dpi}_R{res}.png"
+
+        # check for file name already existing and increment file name -
+        # one directory scan answers every collision check in memory
+        existing_names = {entry.name for entry in os.scandir(os.getcwd())}
+        base_name, extension = os.path.splitext(plot_name)
+        counter = 1
+        while plot_name in existing_names:
+            plot_name = f"{base_name}_{counter}{extension}"
+            counter += 1
+
+        fig.savefig(plot_name, dpi=dpi, bbox_inches="tight")
+        print(f"complete! saved as {plot_name}")
 
-def plot_chunks(ndwi, mndwi, index_chunks, plot_size_chunks, i, title_size, 
+    # a single show at the end displays the one combined figure
+    print("displaying index images", end="... ")
+    plt.show()
+    print("index image display complete!")
+
+# persistent artists for plot_chunks, keyed by name, so the labelling loop
+# reuses one figure across chunks instead of rebuilding it every iteration
+_chunk_plot_state = {}
+
+def plot_chunks(ndwi, mndwi, index_chunks, plot_size_chunks, i, title_size,
                 label_size, tci_chunks, tci_60_array):
     """
     Plots image chunks of calculated indices (NDWI and MNDWI) and True Color 
@@ -228,66 +458,92 @@ def plot_chunks(ndwi, mndwi, index_chunks, plot_size_chunks, i, title_size,
     
     """
     index_labels = ["NDWI", "MNDWI"]
-    norm_ndwi = colors.Normalize(vmin=np.nanmin(ndwi), 
-                                 vmax=np.nanmax(ndwi)*0.8)
-    norm_mndwi = colors.Normalize(vmin=np.nanmin(mndwi), 
-                                 vmax=np.nanmax(mndwi)*0.8)
-    
-    fig, axes = plt.subplots(2, 2, figsize=plot_size_chunks)
-    # plot 1, top left: NDWI chunk (full resolution)
-    axes[0][0].imshow(index_chunks[0][i], norm=norm_ndwi)
-    axes[0][0].set_title(f"{index_labels[0]} Chunk {i}", 
+    state = _chunk_plot_state
+
+    if not state or not plt.fignum_exists(state["fig"].number):
+        # build the figure a single time; the labelling loop then only
+        # updates the artists, which is far cheaper than constructing four
+        # axes (and recomputing the full-image norms) for every chunk
+        norm_ndwi = colors.Normalize(vmin=np.nanmin(ndwi),
+                                     vmax=np.nanmax(ndwi)*0.8)
+        norm_mndwi = colors.Normalize(vmin=np.nanmin(mndwi),
+                                     vmax=np.nanmax(mndwi)*0.8)
+
+        fig, axes = plt.subplots(2, 2, figsize=plot_size_chunks)
+        # plot 1, top left: NDWI chunk (full resolution)
+        # plot 2, top right: MNDWI chunk (merged resolution)
+        # plot 3, bottom left: TCI chunk (full resolution)
+        images = [axes[0][0].imshow(index_chunks[0][i], norm=norm_ndwi),
+                  axes[0][1].imshow(index_chunks[1][i], norm=norm_mndwi),
+                  axes[1][0].imshow(tci_chunks[i])]
+        axes[0][0].tick_params(axis="both", labelsize=label_size)
+        axes[0][1].tick_params(axis="both", labelsize=label_size)
+        axes[1][0].tick_params(axis="both", labelsize=label_size)
+
+        # plot 4, bottom right: tracker TCI (60m resolution)
+        axes[1][1].imshow(tci_60_array)
+        axes[1][1].set_title("Tracker TCI", fontsize=title_size)
+        axes[1][1].axis("on")
+
+        tracker_text = axes[1][1].text(0.5, 0.95, "",
+                        transform=axes[1][1].transAxes, ha="center",
+                        va="center", fontsize=label_size+1, color="yellow")
+
+        # axes on TCI "tracker" image are "number of chunks"
+        chunks_per_side = int(np.sqrt(len(tci_chunks)))
+        side_length = tci_60_array.shape[0] # assuming square image
+        axes[1][1].set_xticks(np.linspace(0, side_length, 8))
+        axes[1][1].set_yticks(np.linspace(0, side_length, 8))
+        axes_tick_labels = np.linspace(0, chunks_per_side, 8).astype(int)
+        axes[1][1].set_xticklabels(axes_tick_labels, fontsize=label_size)
+        axes[1][1].set_yticklabels(axes_tick_labels, fontsize=label_size)
+        axes[1][1].set_xlabel("Chunk Column", fontsize=label_size+1)
+        axes[1][1].set_ylabel("Chunk Row", fontsize=label_size+1)
+
+        # one reusable red square that tracks the current chunk; it is
+        # moved with set_xy rather than recreated per call
+        chunk_length = side_length / chunks_per_side
+        tci_tracker_square = plt.Rectangle((0, 0),
+                                       chunk_length, chunk_length,
+                                       linewidth=1, edgecolor="r",
+                                       facecolor=None)
+        axes[1][1].add_patch(tci_tracker_square)
+
+        plt.tight_layout()
+        state.update(fig=fig, axes=axes, images=images,
+                     tracker_text=tracker_text,
+                     tracker_square=tci_tracker_square)
+        plt.show(block=False)
+    else:
+        fig = state["fig"]
+        axes = state["axes"]
+        state["images"][0].set_data(index_chunks[0][i])
+        state["images"][1].set_data(index_chunks[1][i])
+        state["images"][2].set_data(tci_chunks[i])
+
+    # per-chunk titles and tracker geometry
+    axes[0][0].set_title(f"{index_labels[0]} Chunk {i}",
                          fontsize=title_size)
-    axes[0][0].tick_params(axis="both", labelsize=label_size)
-    
-    # plot 2, top right: MNDWI chunk (merged resolution)
-    axes[0][1].imshow(index_chunks[1][i], norm=norm_mndwi)
-    axes[0][1].set_title(f"{index_labels[1]} Chunk {i}", 
+    axes[0][1].set_title(f"{index_labels[1]} Chunk {i}",
                          fontsize=title_size)
-    axes[0][1].tick_params(axis="both", labelsize=label_size)
-    
-    # plot 3, bottom left: TCI chunk (full resolution)
-    axes[1][0].imshow(tci_chunks[i])
     axes[1][0].set_title(f"TCI Chunk {i}", fontsize=title_size)
-    axes[1][0].tick_params(axis="both", labelsize=label_size)
-    
-    # plot 4, bottom right: tracker TCI (60m resolution)
-    axes[1][1].imshow(tci_60_array)
-    axes[1][1].set_title("Tracker TCI", fontsize=title_size)
-    axes[1][1].axis("on")
-    
+
     # calculate chunk geometry
     chunks_per_side = int(np.sqrt(len(tci_chunks)))
     chunk_col = i % chunks_per_side
     chunk_row = i // chunks_per_side
-    axes[1][1].text(0.5, 0.95, f"COL {chunk_col} ROW {chunk_row}", 
-                    transform=axes[1][1].transAxes, ha="center", 
-                    va="center", fontsize=label_size+1, color="yellow")
-    
+    state["tracker_text"].set_text(f"COL {chunk_col} ROW {chunk_row}")
+
     # calculate dimensions in the 60m array
     side_length = tci_60_array.shape[0] # assuming square image
     chunk_length = side_length / chunks_per_side
-    chunk_ulx = chunk_col * chunk_length
-    chunk_uly = chunk_row * chunk_length
-    
-    # axes on TCI "tracker" image are "number of chunks"
-    axes[1][1].set_xticks(np.linspace(0, side_length, 8))
-    axes[1][1].set_yticks(np.linspace(0, side_length, 8))
-    axes_tick_labels = np.linspace(0, chunks_per_side, 8).astype(int)
-    axes[1][1].set_xticklabels(axes_tick_labels, fontsize=label_size)
-    axes[1][1].set_yticklabels(axes_tick_labels, fontsize=label_size)
-    axes[1][1].set_xlabel("Chunk Column", fontsize=label_size+1)
-    axes[1][1].set_ylabel("Chunk Row", fontsize=label_size+1)
-    
-    # draw a red square around the current chunk
-    tci_tracker_square = plt.Rectangle((chunk_ulx, chunk_uly), 
-                                   chunk_length, chunk_length, 
-                                   linewidth=1, edgecolor="r", 
-                                   facecolor=None)
-    axes[1][1].add_patch(tci_tracker_square)
-    
-    plt.tight_layout()
-    plt.show()
+
+    # move the red square onto the current chunk
+    state["tracker_square"].set_xy((chunk_col * chunk_length,
+                                    chunk_row * chunk_length))
+
+    fig.canvas.draw_idle()
+    fig.canvas.flush_events()
 
 def save_image_file(data, image_name, normalise, coordinates, 
                     g_min, g_max, dupe_check):
@@ -325,11 +581,11 @@ def save_image_file(data, image_name, normalise, coordinates,
                  norm = plt.Normalize(g_min, g_max)
                  cmap = plt.get_cmap("viridis")
                  # Apply norm and cmap. Handle potential NaN values if any remain.
-                 # cmap might handle NaNs depending on matplotlib version, or 
+                 # cmap might handle NaNs depending on matplotlib version, or
                  # set a bad color.
-                 rgba_data = cmap(norm(cropped_data))
-                 # Convert to uint8
-                 final_data = (255 * rgba_data).astype(np.uint8)
+                 # bytes=True makes the colormap emit uint8 directly, which
+                 # skips the float64 RGBA array plus the scale-and-cast pass
+                 final_data = cmap(norm(cropped_data), bytes=True)
         else:
              # Handle non-normalized data (e.g., TCI) - needs uint8 conversion 
              # if not already
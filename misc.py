@@ -2,7 +2,13 @@ import numpy as np
 import random
 import math
 import sys
+import os
+import functools
+from PIL import Image
+from matplotlib import pyplot as plt
+from data_handling import check_duplicate_name
 
+@functools.lru_cache(maxsize=None)
 def get_sentinel_bands(sentinel_n, high_res):
     """
     Sentinel 2 has thirteen spectral bands, five of which are of interest for 
@@ -50,28 +56,51 @@ def get_sentinel_bands(sentinel_n, high_res):
             NIR_BAND = '8A'
         return BLUE_BAND, GREEN_BAND, NIR_BAND, SWIR1_BAND, SWIR2_BAND
 
-def split_array(array, n_chunks):
+def split_array(array, n_chunks, out=None):
     """
-    Split any integer array into any number of chunks. 
-    
+    Split any array into a square grid of equally sized chunks.
+
+    The square root of n_chunks is rounded down to form the side length of
+    the chunk grid, and the array is cropped to the largest size that the
+    grid divides evenly. Rather than allocating thousands of small
+    sub-arrays, the cropped array is retiled in one operation and every
+    chunk is a contiguous slab of the single returned array, which keeps
+    per-chunk reductions and plotting cache-friendly.
+
     Parameters
     ----------
     array : numpy array
-        A numpy array containing integers.
+        A two-dimensional numpy array, or a three-dimensional one such as a
+        three-channel true colour image.
     n_chunks : int
         The number of chunks into which the array must be split.
-    
+    out : numpy array, optional
+        A preallocated array of the output shape to write the chunks
+        into. Callers stacking several split results can pass slices of
+        one larger array so each result lands in place rather than being
+        copied a second time by np.stack.
+
     Returns
     -------
-    chunks : list
-        A list containing every chunk split off from the full array.
-    
+    chunks : numpy array
+        An array of shape (n, chunk_height, chunk_width) - with a trailing
+        channel axis if the input has one - containing every chunk split
+        off from the full array, indexable exactly like the old list.
+        This is the out array when one was given.
+
     """
-    rows = np.array_split(array, np.sqrt(n_chunks), axis=0) # split into rows
-    split_arrays = [np.array_split(row_chunk, np.sqrt(n_chunks), 
-                                   axis=1) for row_chunk in rows]
-    chunks = [subarray for row_chunk in split_arrays for subarray in row_chunk]
-    return chunks
+    side = math.isqrt(n_chunks)
+    chunk_height = array.shape[0] // side
+    chunk_width = array.shape[1] // side
+    cropped = array[:side * chunk_height, :side * chunk_width]
+    tiled = cropped.reshape((side, chunk_height, side, chunk_width)
+                            + cropped.shape[2:]).swapaxes(1, 2)
+    if out is None:
+        out = np.empty((side * side, chunk_height, chunk_width)
+                       + cropped.shape[2:], dtype=array.dtype)
+    out.reshape((side, side, chunk_height, chunk_width)
+                + cropped.shape[2:])[...] = tiled
+    return out
 
 def combine_sort_unique(*arrays):
     """
@@ -249,12 +278,9 @@ def confirm_continue_or_exit():
             print("invalid input. 'y' for yes or 'n' for no.")
 
 """
-This section is storage for functions that are not currently used in the IPDMP 
-program but may be useful in future. 
+This section is storage for functions that are not currently used in the IPDMP
+program but may be useful in future.
 """
-from PIL import Image
-import os
-
 def logical_checks(high_res, show_index_plots, save_images, label_data):
     # saving nothing
     if save_images and not show_index_plots:
@@ -287,8 +313,6 @@ def logical_checks(high_res, show_index_plots, save_images, label_data):
             print("ok")
     return high_res, show_index_plots, save_images, label_data
 
-from matplotlib import pyplot as plt
-from data_handling import check_duplicate_name
 def save_image_file(data, image_name, normalise):
     if normalise:
         cmap = plt.get_cmap("viridis")
@@ -85,6 +85,28 @@ def end_spinner(stop_event, thread):
     stop_event.set()
     thread.join()
 
+def timed_input(prompt):
+    """
+    Wrap the built-in input call with a monotonic timer so that callers can
+    subtract the time spent waiting on the user from their own timings.
+
+    Parameters
+    ----------
+    prompt : string
+        The prompt passed straight through to input.
+
+    Returns
+    -------
+    response : string
+        The user's response, exactly as input returned it.
+    elapsed : float
+        The number of seconds spent waiting for the response.
+
+    """
+    start_time = time.monotonic()
+    response = input(prompt)
+    return response, time.monotonic() - start_time
+
 def prompt_roi(image_array, n):
     """
     Opens a Tkinter window displaying the image (as a numpy array).
@@ -111,7 +133,13 @@ def prompt_roi(image_array, n):
     
     """
     # Convert the numpy array to a PIL image
-    image = Image.fromarray(image_array)
+    # decimate big arrays with a strided view first, so PIL only ever
+    # resamples something close to the 500 pixel display size instead of
+    # the full-resolution array
+    step_y = max(image_array.shape[0] // 500, 1)
+    step_x = max(image_array.shape[1] // 500, 1)
+    image = Image.fromarray(
+        np.ascontiguousarray(image_array[::step_y, ::step_x]))
     image = image.resize((500, 500))  # Resize the image to fit in the window
     width, height = image.size
     